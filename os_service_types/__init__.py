@@ -13,12 +13,15 @@
 # under the License.
 __all__ = ['__version__', 'ServiceTypes']
 
+import threading
+
 import pbr.version
 
 from os_service_types.service_types import ServiceTypes  # flake8: noqa
 
 __version__ = pbr.version.VersionInfo('os-service-types').version_string()
 _service_type_manager = None
+_service_type_manager_lock = threading.Lock()
 
 
 def get_service_types(*args, **kwargs):
@@ -36,6 +39,8 @@ def get_service_types(*args, **kwargs):
         :class:`~os_service_types.service_types.ServiceTypes`
     """
     global _service_type_manager
-    if not _service_type_manager:
-        _service_type_manager = ServiceTypes(*args, **kwargs)
+    if _service_type_manager is None:
+        with _service_type_manager_lock:
+            if _service_type_manager is None:
+                _service_type_manager = ServiceTypes(*args, **kwargs)
     return _service_type_manager
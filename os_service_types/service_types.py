@@ -13,22 +13,191 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+import collections
+import functools
+import json
 
 import os_service_types.data
 from os_service_types import exc
 
 __all__ = ['ServiceTypes']
 
-BUILTIN_DATA = os_service_types.data.read_data('service-types.json')
 SERVICE_TYPES_URL = "https://service-types.openstack.org/service-types.json"
 
 
+@functools.lru_cache(maxsize=None)
+def _get_builtin_data():
+    return _freeze(os_service_types.data.read_data('service-types.json'))
+
+
+def __getattr__(name):
+    # BUILTIN_DATA is only parsed the first time something asks for it, so
+    # that importing the library doesn't pay for data it may never use.
+    if name == 'BUILTIN_DATA':
+        return _get_builtin_data()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+@functools.lru_cache(maxsize=512)
 def _normalize_type(service_type):
     if service_type:
+        if '_' not in service_type:
+            return service_type
         return service_type.replace('_', '-')
 
 
+def _thaw(obj):
+    """Return a mutable deep copy of data produced by _freeze."""
+    if isinstance(obj, dict):
+        return {key: _thaw(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_thaw(value) for value in obj]
+    return obj
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Service-types data is read-only")
+
+
+class _FrozenDict(dict):
+    """A dict that can't be modified.
+
+    Copying or pickling it produces ordinary dicts and lists, so callers can
+    still get a mutable version of the data with copy.deepcopy.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (dict, (_thaw(self),))
+
+
+class _FrozenList(list):
+    """A list that can't be modified.
+
+    Copying or pickling it produces ordinary dicts and lists, so callers can
+    still get a mutable version of the data with copy.deepcopy.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = _read_only
+    reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (list, (_thaw(self),))
+
+
+def _freeze(obj):
+    """Return a read-only version of data decoded from JSON.
+
+    dicts and lists become read-only subclasses of themselves, so the data
+    can be shared between instances and handed to callers without copying.
+    """
+    if isinstance(obj, dict):
+        return _FrozenDict(
+            (key, _freeze(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return _FrozenList(_freeze(value) for value in obj)
+    return obj
+
+
+_Index = collections.namedtuple(
+    '_Index', ['service_by_type', 'service_data_by_type', 'equiv_class',
+               'services_by_project'])
+
+
+def _build_index(data):
+    """Build the lookup tables used by ServiceTypes for a frozen data set."""
+    service_by_type = {
+        service['service_type']: service for service in data['services']}
+    # Official types and aliases both map to the official service data.
+    service_data_by_type = dict(service_by_type)
+    # An official type and all of its aliases share a class id.
+    equiv_class = {}
+    for class_id, official in enumerate(service_by_type):
+        equiv_class[official] = class_id
+        for alias in data['forward'].get(official, ()):
+            equiv_class[alias] = class_id
+            service_data_by_type[alias] = service_by_type[official]
+    # Resolve the listed types the way get_service_data would, in case the
+    # data names an alias or an underscored type.
+    services_by_project = {
+        project: tuple(
+            service_data_by_type.get(_normalize_type(service_type))
+            for service_type in service_types)
+        for project, service_types
+        in data['service_types_by_project'].items()}
+    return _Index(
+        service_by_type, service_data_by_type, equiv_class,
+        services_by_project)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_builtin_index():
+    return _build_index(_get_builtin_data())
+
+
+_RemoteData = collections.namedtuple(
+    '_RemoteData', ['etag', 'last_modified', 'data', 'index'])
+# Last data fetched from each URL, along with the validators needed to make
+# a conditional request for it.
+_remote_data_cache = {}
+
+
+def _get_remote_data(session):
+    """Fetch, freeze and index the remote service-types data.
+
+    If the data has been fetched before, the request is made conditional on
+    it having changed, and the previously parsed data is reused when the
+    server answers 304 Not Modified.
+    """
+    cached = _remote_data_cache.get(SERVICE_TYPES_URL)
+    headers = {}
+    if cached:
+        if cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+    response = session.get(SERVICE_TYPES_URL, headers=headers)
+    response.raise_for_status()
+    if cached and response.status_code == 304:
+        return cached.data, cached.index
+    # json accepts the raw bytes, which avoids decoding the whole body to a
+    # str first.
+    try:
+        data = json.loads(response.content)
+    except ValueError as e:
+        # response.json() raised an IOError subclass here, which callers
+        # rely on to fall back to the builtin data.
+        raise IOError(
+            "Invalid service-types data from {url}: {e}".format(
+                url=SERVICE_TYPES_URL, e=e)) from e
+    data = _freeze(data)
+    index = _build_index(data)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        _remote_data_cache[SERVICE_TYPES_URL] = _RemoteData(
+            etag, last_modified, data, index)
+    else:
+        _remote_data_cache.pop(SERVICE_TYPES_URL, None)
+    return data, index
+
+
 class ServiceTypes(object):
     """Encapsulation of the OpenStack Service Types Authority data.
 
@@ -58,24 +227,29 @@ class ServiceTypes(object):
         if not session and only_remote:
             raise ValueError(
                 "only_remote was requested but no Session was provided.")
-        self._service_types_data = BUILTIN_DATA
+        self._service_types_data = None
         self._warn = warn
         if session:
             try:
-                response = session.get(SERVICE_TYPES_URL)
-                response.raise_for_status()
-                self._service_types_data = response.json()
+                self._service_types_data, index = _get_remote_data(session)
             except IOError:
                 # If we can't fetch, fall backto BUILTIN
                 if only_remote:
                     raise
+        if self._service_types_data is None:
+            self._service_types_data = _get_builtin_data()
+            index = _get_builtin_index()
+        self._service_by_type = index.service_by_type
+        self._service_data_by_type = index.service_data_by_type
+        self._equiv_class = index.equiv_class
+        self._services_by_project = index.services_by_project
 
     def _canonical_project_name(self, name):
         "Convert repo name to project name."
         if name is None:
             raise ValueError("Empty project name is not allowed")
         # Handle openstack/ prefix going away from STA data
-        return name.rpartition('/')[-1]
+        return name[name.rfind('/') + 1:]
 
     @property
     def url(self):
@@ -89,59 +263,53 @@ class ServiceTypes(object):
 
     @property
     def forward(self):
-        "Mapping service-type names to their aliases."
-        return copy.deepcopy(self._service_types_data['forward'])
+        "Read-only mapping of service-type names to their aliases."
+        return self._service_types_data['forward']
 
     @property
     def reverse(self):
-        "Mapping aliases to their service-type names."
-        return copy.deepcopy(self._service_types_data['reverse'])
+        "Read-only mapping of aliases to their service-type names."
+        return self._service_types_data['reverse']
 
     @property
     def services(self):
-        "Full service-type data listing."
-        return copy.deepcopy(self._service_types_data['services'])
+        "Read-only full service-type data listing."
+        return self._service_types_data['services']
 
     @property
     def all_types_by_service_type(self):
-        "Mapping of official service type to official type and aliases."
-        return copy.deepcopy(
-            self._service_types_data['all_types_by_service_type'])
+        "Read-only mapping of official service type to all of its types."
+        return self._service_types_data['all_types_by_service_type']
 
     @property
     def primary_service_by_project(self):
-        "Mapping of project name to the primary associated service."
-        return copy.deepcopy(
-            self._service_types_data['primary_service_by_project'])
+        "Read-only mapping of project name to the primary associated service."
+        return self._service_types_data['primary_service_by_project']
 
     @property
     def service_types_by_project(self):
-        "Mapping of project name to a list of all associated service-types."
-        return copy.deepcopy(
-            self._service_types_data['service_types_by_project'])
+        "Read-only mapping of project name to all associated service-types."
+        return self._service_types_data['service_types_by_project']
 
     def get_official_service_data(self, service_type):
         """Get the service data for an official service_type.
 
         :param str service_type: The official service-type to get data for.
-        :returns dict: Service data for the service or None if not found.
+        :returns Mapping: Read-only service data for the service or None if
+            not found.
         """
-        service_type = _normalize_type(service_type)
-        for service in self._service_types_data['services']:
-            if service_type == service['service_type']:
-                return service
-        return None
+        return self._service_by_type.get(_normalize_type(service_type))
 
     def get_service_data(self, service_type):
         """Get the service data for a given service_type.
 
         :param str service_type: The service-type or alias to get data for.
-        :returns dict: Service data for the service or None if not found.
+        :returns Mapping: Read-only service data for the service or None if
+            not found.
         """
-        service_type = self.get_service_type(service_type)
-        if not service_type:
-            return None
-        return self.get_official_service_data(service_type)
+        service_type = _normalize_type(service_type)
+        self._warn_usage(service_type)
+        return self._service_data_by_type.get(service_type)
 
     def is_official(self, service_type):
         """Is the given service-type an official service-type?
@@ -149,7 +317,10 @@ class ServiceTypes(object):
         :param str service_type: The service-type to test.
         :returns bool: True if it's an official type, False otherwise.
         """
-        return self.get_official_service_data(service_type) is not None
+        return self._is_official_norm(_normalize_type(service_type))
+
+    def _is_official_norm(self, service_type):
+        return service_type in self._service_by_type
 
     def is_alias(self, service_type):
         """Is the given service-type an alias?
@@ -157,7 +328,9 @@ class ServiceTypes(object):
         :param str service_type: The service-type to test.
         :returns bool: True if it's an alias type, False otherwise.
         """
-        service_type = _normalize_type(service_type)
+        return self._is_alias_norm(_normalize_type(service_type))
+
+    def _is_alias_norm(self, service_type):
         return service_type in self._service_types_data['reverse']
 
     def is_known(self, service_type):
@@ -166,7 +339,9 @@ class ServiceTypes(object):
         :param str service_type: The service-type to test.
         :returns bool: True if it's a known type, False otherwise.
         """
-        return self.is_official(service_type) or self.is_alias(service_type)
+        service_type = _normalize_type(service_type)
+        return (self._is_official_norm(service_type)
+                or self._is_alias_norm(service_type))
 
     def is_match(self, requested, found):
         """Does a requested service-type match one found in the catalog?
@@ -191,15 +366,22 @@ class ServiceTypes(object):
         if requested == found:
             return True
 
-        # Found is official type, requested is one of its aliases
-        if requested in self.get_aliases(found):
-            return True
-
-        # Found is an alias, requested is an official type
-        if requested == self.get_service_type(found):
+        # Normalization turns empty types into None, which must not make
+        # them match each other.
+        requested = _normalize_type(requested)
+        found = _normalize_type(found)
+        if not requested or not found:
+            return False
+        if requested == found:
             return True
 
-        return False
+        # One of them is an official type and the other is one of its
+        # aliases. Two different aliases never match each other.
+        class_id = self._equiv_class.get(found)
+        if class_id is None or class_id != self._equiv_class.get(requested):
+            return False
+        return (self._is_official_norm(requested)
+                or self._is_official_norm(found))
 
     def get_aliases(self, service_type):
         """Returns the list of aliases for a given official service-type.
@@ -208,7 +390,7 @@ class ServiceTypes(object):
         :returns list: List of aliases, or empty list if there are none.
         """
         service_type = _normalize_type(service_type)
-        return self._service_types_data['forward'].get(service_type, [])
+        return list(self._service_types_data['forward'].get(service_type, ()))
 
     def get_service_type(self, service_type, permissive=False):
         """Given a possible service_type, return the official type.
@@ -218,8 +400,11 @@ class ServiceTypes(object):
             Return the original type if the given service_type is not found.
         :returns str: The official service-type, or None if there is no match.
         """
-        service_type = _normalize_type(service_type)
-        if self.is_official(service_type):
+        return self._get_service_type_norm(
+            _normalize_type(service_type), permissive=permissive)
+
+    def _get_service_type_norm(self, service_type, permissive=False):
+        if self._is_official_norm(service_type):
             return service_type
         official = self._service_types_data['reverse'].get(service_type)
         if permissive and official is None:
@@ -233,17 +418,26 @@ class ServiceTypes(object):
                 exc.AliasUsageWarning, given=service_type, official=official)
         return official
 
+    def _warn_usage(self, service_type):
+        # Emit the same usage warnings get_service_type would for a
+        # normalized service_type.
+        if self._warn:
+            self._get_service_type_norm(service_type)
+
     def get_all_types(self, service_type):
         """Get a list of official types and all known aliases.
 
         :param str service_type: The service-type or alias to get data for.
-        :returns dict: Service data for the service or None if not found.
+        :returns list: The official type followed by its aliases, or a list
+            containing only the given type if it is not known.
         """
         service_type = _normalize_type(service_type)
-        if not self.is_known(service_type):
+        service = self._service_data_by_type.get(service_type)
+        if service is None:
             return [service_type]
-        return self.all_types_by_service_type[
-            self.get_service_type(service_type)]
+        self._warn_usage(service_type)
+        return list(self._service_types_data['all_types_by_service_type'][
+            service['service_type']])
 
     def get_project_name(self, service_type):
         """Return the OpenStack project name for a given service_type.
@@ -251,7 +445,6 @@ class ServiceTypes(object):
         :param str service_type: An official service-type or alias.
         :returns str: The OpenStack project name or None if there is no match.
         """
-        service_type = _normalize_type(service_type)
         service = self.get_service_data(service_type)
         if service:
             return service['project']
@@ -264,10 +457,11 @@ class ServiceTypes(object):
             ``'openstack/{project}'`` or just ``'{project}'``.
         :type name: str
         :raises ValueError: If project_name is None
-        :returns: dict or None if not found
+        :returns: Read-only mapping or None if not found
         """
         project_name = self._canonical_project_name(project_name)
-        return self.primary_service_by_project.get(project_name)
+        return self._service_types_data['primary_service_by_project'].get(
+            project_name)
 
     def get_all_service_data_for_project(self, project_name):
         """Return the information for every service associated with a project.
@@ -276,10 +470,6 @@ class ServiceTypes(object):
             ``'openstack/{project}'`` or just ``'{project}'``.
         :type name: str
         :raises ValueError: If project_name is None
-        :returns: list of dicts
+        :returns: list of read-only mappings
         """
-        data = []
-        for service_type in self.service_types_by_project.get(
-                project_name, []):
-            data.append(self.get_service_data(service_type))
-        return data
+        return list(self._services_by_project.get(project_name, ()))
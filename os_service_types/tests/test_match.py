@@ -42,8 +42,28 @@ class TestMatch(base.TestCase):
             requested='block-storage', found='volumev2', is_match=True)),
         ('block-finds-volumev3', dict(
             requested='block-storage', found='volumev3', is_match=True)),
+        ('block-store-finds-block', dict(
+            requested='block-store', found='block-storage', is_match=True)),
+        ('block-finds-volume', dict(
+            requested='block-storage', found='volume', is_match=True)),
+        ('volume-not-block-store', dict(
+            requested='volume', found='block-store', is_match=False)),
+        ('volumev2-not-compute', dict(
+            requested='volumev2', found='compute', is_match=False)),
         ('volumev2-not-volumev3', dict(
             requested='volumev2', found='volumev3', is_match=False)),
+        ('official-finds-underscore-official', dict(
+            requested='key-manager', found='key_manager', is_match=True)),
+        ('underscore-official-finds-alias', dict(
+            requested='block_storage', found='volumev2', is_match=True)),
+        ('underscore-finds-official', dict(
+            requested='key_manager', found='key-manager', is_match=True)),
+        ('empty-not-none', dict(
+            requested='', found=None, is_match=False)),
+        ('none-not-empty', dict(
+            requested=None, found='', is_match=False)),
+        ('none-not-unknown', dict(
+            requested=None, found='unknown', is_match=False)),
         ('non-match', dict(
             requested='unknown', found='compute', is_match=False)),
     ]
@@ -19,6 +19,12 @@ test_misc
 Miscellaneous tests
 """
 
+import copy
+import json
+import operator
+import pickle
+
+import os_service_types
 from os_service_types import service_types
 from os_service_types.tests import base
 
@@ -30,3 +36,116 @@ class TestMisc(base.TestCase):
 
     def test_normalize_none(self):
         self.assertIsNone(service_types._normalize_type(None))
+
+    def test_normalize_no_underscore(self):
+        self.assertEqual(
+            'block-storage', service_types._normalize_type('block-storage'))
+
+    def test_normalize_empty(self):
+        self.assertIsNone(service_types._normalize_type(''))
+
+    def test_builtin_data_loaded_once(self):
+        self.assertIs(service_types.BUILTIN_DATA, service_types.BUILTIN_DATA)
+
+    def test_missing_module_attribute(self):
+        self.assertRaises(
+            AttributeError, getattr, service_types, 'NOT_BUILTIN_DATA')
+
+    def test_freeze(self):
+        data = {'a': [1, {'b': None}], 'c': 'd', 'e': True}
+        frozen = service_types._freeze(data)
+        self.assertEqual(data, {
+            'a': [1, {'b': None}], 'c': 'd', 'e': True})
+        self.assertEqual([1, {'b': None}], frozen['a'])
+        self.assertEqual('d', frozen['c'])
+        self.assertRaises(TypeError, operator.setitem, frozen, 'c', 'x')
+        self.assertRaises(TypeError, operator.setitem, frozen['a'][1], 'b', 1)
+
+    def test_freeze_mutators(self):
+        frozen = service_types._freeze({'a': 1})
+        for method, args in [
+                ('update', ({'b': 2},)), ('pop', ('a',)), ('popitem', ()),
+                ('setdefault', ('b', 2)), ('clear', ())]:
+            self.assertRaises(TypeError, getattr(frozen, method), *args)
+        self.assertRaises(TypeError, operator.delitem, frozen, 'a')
+        self.assertEqual({'a': 1}, frozen)
+
+        frozen = service_types._freeze([1])
+        for method, args in [
+                ('append', (2,)), ('extend', ([2],)), ('insert', (0, 2)),
+                ('pop', ()), ('remove', (1,)), ('clear', ()), ('sort', ()),
+                ('reverse', ())]:
+            self.assertRaises(TypeError, getattr(frozen, method), *args)
+        self.assertRaises(TypeError, operator.setitem, frozen, 0, 2)
+        self.assertRaises(TypeError, operator.iadd, frozen, [2])
+        self.assertEqual([1], frozen)
+
+    def test_service_data_deepcopy(self):
+        data = os_service_types.ServiceTypes().get_service_data('clustering')
+        data_copy = copy.deepcopy(data)
+        self.assertEqual(data, data_copy)
+        self.assertIs(dict, type(data_copy))
+        self.assertIsInstance(data_copy['aliases'], list)
+        data_copy['project'] = 'other'
+        self.assertEqual('senlin', data['project'])
+
+    def test_service_data_pickle(self):
+        data = os_service_types.ServiceTypes().services
+        data_copy = pickle.loads(pickle.dumps(data))
+        self.assertEqual(data, data_copy)
+        self.assertIs(list, type(data_copy))
+        self.assertIs(dict, type(data_copy[0]))
+
+    def test_service_data_json(self):
+        data = os_service_types.ServiceTypes().get_service_data('clustering')
+        self.assertEqual(data, json.loads(json.dumps(data)))
+
+    def test_instance_deepcopy(self):
+        service_types_copy = copy.deepcopy(os_service_types.ServiceTypes())
+        self.assertEqual(
+            'block-storage', service_types_copy.get_service_type('volume'))
+        self.assertEqual(
+            'cinder', service_types_copy.get_project_name('volume'))
+
+    def test_instance_pickle(self):
+        service_types_copy = pickle.loads(
+            pickle.dumps(os_service_types.ServiceTypes()))
+        self.assertEqual(
+            'block-storage', service_types_copy.get_service_type('volume'))
+        self.assertTrue(service_types_copy.is_match('volume', 'block-storage'))
+
+    def test_properties_read_only(self):
+        forward = os_service_types.ServiceTypes().forward
+        self.assertRaises(TypeError, operator.setitem, forward, 'compute', [])
+        self.assertIsInstance(forward['block-storage'], list)
+        self.assertRaises(
+            TypeError, forward['block-storage'].append, 'not-a-type')
+
+    def test_get_all_types_returns_copy(self):
+        all_types = os_service_types.ServiceTypes().get_all_types('volume')
+        all_types.append('not-a-type')
+        self.assertNotIn(
+            'not-a-type',
+            os_service_types.ServiceTypes().get_all_types('volume'))
+
+    def test_canonical_project_name(self):
+        canonical = os_service_types.ServiceTypes()._canonical_project_name
+        self.assertEqual('nova', canonical('nova'))
+        self.assertEqual('nova', canonical('openstack/nova'))
+        self.assertEqual('', canonical('openstack/'))
+
+    def test_index_project_aliases(self):
+        data = copy.deepcopy(service_types.BUILTIN_DATA)
+        data['service_types_by_project']['cinder'] = [
+            'volume', 'block_storage']
+        index = service_types._build_index(service_types._freeze(data))
+        block_storage = index.service_by_type['block-storage']
+        self.assertEqual(
+            (block_storage, block_storage),
+            index.services_by_project['cinder'])
+
+    def test_builtin_index_shared(self):
+        first = os_service_types.ServiceTypes()
+        second = os_service_types.ServiceTypes()
+        self.assertIs(first._service_by_type, second._service_by_type)
+        self.assertIs(first._services_by_project, second._services_by_project)
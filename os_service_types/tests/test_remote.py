@@ -21,6 +21,9 @@ Tests for `ServiceTypes` class remote data.
 oslotest sets up a TempHomeDir for us, so there should be no ~/.cache files
 available in these tests.
 """
+from unittest import mock
+
+import fixtures
 from requests_mock.contrib import fixture as rm_fixture
 from testscenarios import load_tests_apply_scenarios as load_tests  # noqa
 
@@ -31,10 +34,20 @@ import os_service_types.service_types
 from os_service_types.tests import base
 
 
-class TestRemote(base.TestCase, base.ServiceDataMixin):
+class RemoteMixin(object):
+
+    def _clear_remote_data_cache(self):
+        patcher = mock.patch.dict(
+            os_service_types.service_types._remote_data_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestRemote(base.TestCase, base.ServiceDataMixin, RemoteMixin):
 
     def setUp(self):
         super(TestRemote, self).setUp()
+        self._clear_remote_data_cache()
         # Set up a requests_mock fixture for all HTTP traffic
         adapter = self.useFixture(rm_fixture.Fixture())
         adapter.register_uri(
@@ -50,3 +63,79 @@ class TestRemote(base.TestCase, base.ServiceDataMixin):
 
     def test_remote_version(self):
         self.assertEqual(self.remote_version, self.service_types.version)
+
+
+class TestRemoteConditional(base.TestCase, RemoteMixin):
+
+    def setUp(self):
+        super(TestRemoteConditional, self).setUp()
+        self._clear_remote_data_cache()
+        self.adapter = self.useFixture(rm_fixture.Fixture())
+        self.etag = self.getUniqueString('etag')
+        self.session = keystoneauth1.session.Session()
+
+    def test_not_modified(self):
+        self.adapter.register_uri(
+            'GET', os_service_types.service_types.SERVICE_TYPES_URL, [
+                dict(json=self.remote_content,
+                     headers={'etag': self.etag}),
+                dict(status_code=304),
+            ])
+        first = os_service_types.ServiceTypes(session=self.session)
+        second = os_service_types.ServiceTypes(session=self.session)
+
+        self.assertEqual(2, len(self.adapter.request_history))
+        self.assertNotIn(
+            'If-None-Match', self.adapter.request_history[0].headers)
+        self.assertEqual(
+            self.etag,
+            self.adapter.request_history[1].headers['If-None-Match'])
+        self.assertEqual(self.remote_version, second.version)
+        self.assertIs(first.services, second.services)
+
+    def test_patched_url(self):
+        url = 'https://example.com/service-types.json'
+        self.useFixture(fixtures.MockPatchObject(
+            os_service_types.service_types, 'SERVICE_TYPES_URL', url))
+        self.adapter.register_uri('GET', url, json=self.remote_content)
+        service_types = os_service_types.ServiceTypes(session=self.session)
+
+        self.assertEqual(url, self.adapter.last_request.url)
+        self.assertEqual(self.remote_version, service_types.version)
+
+    def test_modified(self):
+        new_content = dict(self.remote_content, version='new-version')
+        self.adapter.register_uri(
+            'GET', os_service_types.service_types.SERVICE_TYPES_URL, [
+                dict(json=self.remote_content,
+                     headers={'etag': self.etag}),
+                dict(json=new_content),
+            ])
+        os_service_types.ServiceTypes(session=self.session)
+        service_types = os_service_types.ServiceTypes(session=self.session)
+
+        self.assertEqual('new-version', service_types.version)
+        self.assertNotIn(
+            os_service_types.service_types.SERVICE_TYPES_URL,
+            os_service_types.service_types._remote_data_cache)
+
+
+class TestRemoteInvalid(base.TestCase, RemoteMixin):
+
+    def setUp(self):
+        super(TestRemoteInvalid, self).setUp()
+        self._clear_remote_data_cache()
+        adapter = self.useFixture(rm_fixture.Fixture())
+        adapter.register_uri(
+            'GET', os_service_types.service_types.SERVICE_TYPES_URL,
+            text='not json')
+        self.session = keystoneauth1.session.Session()
+
+    def test_invalid_json_falls_back(self):
+        service_types = os_service_types.ServiceTypes(session=self.session)
+        self.assertEqual(self.builtin_version, service_types.version)
+
+    def test_invalid_json_only_remote(self):
+        self.assertRaises(
+            IOError, os_service_types.ServiceTypes,
+            session=self.session, only_remote=True)
@@ -18,6 +18,10 @@ test_singleton
 
 Tests for `get_service_types` singleton factory function.
 """
+import threading
+import time
+from unittest import mock
+
 import os_service_types
 from os_service_types.tests import base
 
@@ -36,3 +40,31 @@ class TestSingleton(base.TestCase):
     def test_singleton_different(self):
         service_types = os_service_types.ServiceTypes()
         self.assertFalse(service_types is self.service_types)
+
+    def test_singleton_threaded(self):
+        patcher = mock.patch.object(
+            os_service_types, '_service_type_manager', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def slow_service_types(*args, **kwargs):
+            time.sleep(0.01)
+            return object()
+
+        results = []
+        with mock.patch.object(
+                os_service_types, 'ServiceTypes',
+                side_effect=slow_service_types) as service_types_mock:
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        os_service_types.get_service_types()))
+                for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(1, service_types_mock.call_count)
+        self.assertEqual(10, len(results))
+        for service_types in results:
+            self.assertIs(results[0], service_types)
@@ -44,6 +44,24 @@ class TestWarnOn(base.TestCase):
             self.service_types.get_service_type('block-storage')
             self.assertEqual(0, len(w))
 
+    def test_warning_emitted_on_alias_service_data(self):
+        with warnings.catch_warnings(record=True) as w:
+            self.service_types.get_service_data('volumev2')
+            self.assertEqual(1, len(w))
+            self.assertTrue(issubclass(w[-1].category, exc.AliasUsageWarning))
+
+    def test_warning_emitted_on_alias_all_types(self):
+        with warnings.catch_warnings(record=True) as w:
+            self.service_types.get_all_types('volumev2')
+            self.assertEqual(1, len(w))
+            self.assertTrue(issubclass(w[-1].category, exc.AliasUsageWarning))
+
+    def test_warning_not_emitted_on_match(self):
+        with warnings.catch_warnings(record=True) as w:
+            self.service_types.is_match('block-storage', 'volumev2')
+            self.service_types.is_match('compute', 'swift')
+            self.assertEqual(0, len(w))
+
 
 class TestWarnOff(base.TestCase):
 